@@ -2,199 +2,404 @@
 
 # IMPORTS
 import os
+import re
 import time
+import asyncio
+import aiohttp
+import orjson
 import pandas as pd
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from playwright.sync_api import sync_playwright
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # INIT
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 BINANCE_ENDPOINT = os.getenv("BINANCE_ENDPOINT")
 DB_CONN = os.getenv("DB_CONN")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Set once to delete existing duplicate articles so the dedup index can be built
+DEDUPE_ARTICLES = os.getenv("DEDUPE_ARTICLES", "false").lower() == "true"
+USE_PLAYWRIGHT = os.getenv("USE_PLAYWRIGHT", "false").lower() == "true"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+MAX_CONCURRENT_REQUESTS = 10
+
+# Shared keep-alive session for the listing page and Binance, retrying transient errors
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # raise_on_status=False hands back the last 429/5xx so callers check status_code
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+# u.today's format first (e.g. "Thu, 21/11/2024 - 14:05"), then variants without
+# the weekday or separator; strptime already accepts single-digit fields
+ARTICLE_DATE_FORMATS = (
+    "%a, %d/%m/%Y - %H:%M",
+    "%d/%m/%Y - %H:%M",
+    "%a, %d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+)
+
+# Built once per process so warm invocations reuse the loaded lexicon
+_SIA = SentimentIntensityAnalyzer()
+LISTING_URL = "https://u.today/search/node?keys=bitcoin"
+
+# Playwright fallback, started lazily by _get_page()
+_PW = None
+_BROWSER = None
+
+# Kept at module scope so warm Lambda invocations reuse the open connection
+_CONN_POOL = None
+
+
+def get_conn_pool():
+    global _CONN_POOL
+    if _CONN_POOL is None or _CONN_POOL.closed:
+        _CONN_POOL = ThreadedConnectionPool(1, 3, DB_CONN)
+    return _CONN_POOL
+
+
+def reset_conn_pool():
+    global _CONN_POOL
+    if _CONN_POOL is not None and not _CONN_POOL.closed:
+        _CONN_POOL.closeall()
+    _CONN_POOL = None
+
+
+def get_conn():
+    # A warm container can hold a connection the server has since closed, so
+    # check it before use and rebuild the pool once if it is dead
+    conn = get_conn_pool().getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        print("🔌 Stale database connection, reconnecting")
+        reset_conn_pool()
+        conn = get_conn_pool().getconn()
+    return conn
 
 
-def create_tables_if_not_exists():
+def create_tables_if_not_exists(conn):
     try:
-        with psycopg2.connect(DB_CONN) as conn:
-            with conn.cursor() as cur: 
-                cur.execute('''
-                    CREATE TABLE IF NOT EXISTS value (
-                        open_time TIMESTAMPTZ PRIMARY KEY,
-                        open NUMERIC, high NUMERIC, low NUMERIC, close NUMERIC, volume NUMERIC,
-                        close_time TIMESTAMPTZ, quote_asset_volume NUMERIC,
-                        number_of_trades INTEGER, taker_buy_base_asset_volume NUMERIC,
-                        taker_buy_quote_asset_volume NUMERIC, ignore TEXT
-                    );
-                ''')
+        with conn.cursor() as cur: 
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS value (
+                    open_time TIMESTAMPTZ PRIMARY KEY,
+                    open NUMERIC, high NUMERIC, low NUMERIC, close NUMERIC, volume NUMERIC,
+                    close_time TIMESTAMPTZ, quote_asset_volume NUMERIC,
+                    number_of_trades INTEGER, taker_buy_base_asset_volume NUMERIC,
+                    taker_buy_quote_asset_volume NUMERIC, ignore TEXT
+                );
+            ''')
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                    title TEXT, link TEXT, author TEXT,
+                    datetime TIMESTAMPTZ, content TEXT, sentiment TEXT
+                );
+            ''')
+            conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error creating tables: {e}")
+
+
+def create_article_dedup_index(conn):
+    # Lets inserts deduplicate on (title, datetime) without reading the table first.
+    # NULLS NOT DISTINCT (Postgres 15+) makes undated articles collide too.
+    # Returns False when the index is missing, so only the article insert is skipped
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('articles_title_dt_key')")
+            (index,) = cur.fetchone()
+            if index is None:
+                cur.execute("SET LOCAL lock_timeout = '5s'")
+                if DEDUPE_ARTICLES:
+                    # One-off, opt-in: rows stored before the index existed can hold
+                    # duplicates that make it fail to build. Keep the oldest per key
+                    cur.execute('''
+                        DELETE FROM articles WHERE id IN (
+                            SELECT id FROM (
+                                SELECT id, row_number() OVER (
+                                    PARTITION BY lower(btrim(title)), datetime ORDER BY id
+                                ) AS rn
+                                FROM articles
+                            ) ranked
+                            WHERE rn > 1
+                        );
+                    ''')
+                    print(f"🧹 Removed {cur.rowcount} duplicate articles")
                 cur.execute('''
-                    CREATE TABLE IF NOT EXISTS articles (
-                        id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                        title TEXT, link TEXT, author TEXT,
-                        datetime TIMESTAMPTZ, content TEXT, sentiment TEXT
-                    );
+                    CREATE UNIQUE INDEX articles_title_dt_key
+                    ON articles (lower(btrim(title)), datetime) NULLS NOT DISTINCT;
                 ''')
-                conn.commit()
+        conn.commit()
+        return True
     except Exception as e:
-        print(f"❌ Error creating tables: {e}")
+        conn.rollback()
+        print(f"❌ Article dedup index missing, skipping article insert: {e}")
+        return False
+
+
+def parse_article_date(raw_date):
+    # strptime on the known u.today formats; dateutil only for anything unexpected
+    cleaned = ' '.join(raw_date.split())
+    for fmt in ARTICLE_DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).strftime("%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            continue
+    ts = pd.to_datetime(cleaned, errors="coerce", dayfirst=True)
+    if pd.isnull(ts):
+        print(f"⚠️ Unrecognized article date: {raw_date!r}")
+        return None
+    return ts.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _class_xpath(tag, cls):
+    return etree.XPath(f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]")
+
+
+_TITLE_XPATH = _class_xpath('h1', 'article__title')
+_DATE_XPATH = _class_xpath('div', 'article__short-date')
+_AUTHOR_XPATH = _class_xpath('div', 'author-brief__name')
+_PARAGRAPH_XPATH = etree.XPath('//p[@dir="ltr"]')
+_BY_RE = re.compile(r'^by\s+', re.I)
+
+
+def _text(el):
+    return etree.tostring(el, method='text', encoding='unicode', with_tail=False).strip()
+
+
+def parse_article(link, html):
+    tree = lxml.html.fromstring(html)
+    h1_tags = _TITLE_XPATH(tree)
+    article_title = _text(h1_tags[0]) if h1_tags else 'N/A'
+
+    date_tags = _DATE_XPATH(tree)
+    raw_date = _text(date_tags[0]) if date_tags else None
+    article_datetime = parse_article_date(raw_date) if raw_date else None
 
+    author_tags = _AUTHOR_XPATH(tree)
+    author_name = _BY_RE.sub('', _text(author_tags[0])) if author_tags else 'N/A'
 
-def scrape_articles():
-    results = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto("https://u.today/search/node?keys=bitcoin", timeout=60000)
-        page.wait_for_timeout(3000)  # wait for content to load
-
-        soup = BeautifulSoup(page.content(), 'html.parser')
-        articles = soup.find_all('div', class_='news__item')
-
-        for article in articles:
-            try:
-                title_tag = article.find('div', class_='news__item-title')
-                a_tag = title_tag.find_parent('a') if title_tag else None
-                href = a_tag['href'] if a_tag and 'href' in a_tag.attrs else None
-                link = href if href and href.startswith("http") else f"https://u.today{href}" if href else None
-                if not link:
-                    continue
-
-                response = requests.get(link)
-                if response.status_code != 200:
-                    continue
-
-                article_soup = BeautifulSoup(response.text, 'html.parser')
-                h1_tag = article_soup.find('h1', class_='article__title')
-                article_title = h1_tag.get_text(strip=True) if h1_tag else 'N/A'
-
-                date_tag = article_soup.find('div', class_='article__short-date')
-                raw_date = date_tag.get_text(strip=True) if date_tag else None
-                article_datetime = pd.to_datetime(raw_date, errors="coerce", dayfirst=True).strftime("%Y-%m-%dT%H:%M:%S") if raw_date else None
-
-                author_tag = article_soup.find('div', class_='author-brief__name')
-                author_name = author_tag.get_text(strip=True) if author_tag else 'N/A'
-                if author_name.lower().startswith('by'):
-                    author_name = author_name[2:].strip()
-
-                p_tags = article_soup.find_all('p', attrs={'dir': 'ltr'})
-                article_text = '\n'.join([p.get_text(strip=True) for p in p_tags]) if p_tags else 'N/A'
-
-                sentiment = get_sentiment_label(article_text)
-
-                results.append({
-                    'title': article_title,
-                    'datetime': article_datetime,
-                    'author': author_name,
-                    'link': link,
-                    'content': article_text,
-                    'sentiment': sentiment
-                })
-
-            except Exception as e:
-                print(f"Error processing article: {e}")
-
-        browser.close()
+    p_tags = _PARAGRAPH_XPATH(tree)
+    article_text = '\n'.join(_text(p) for p in p_tags) if p_tags else 'N/A'
+
+    return {
+        'title': article_title,
+        'datetime': article_datetime,
+        'author': author_name,
+        'link': link,
+        'content': article_text
+    }
+
+
+async def fetch_and_parse(link, session, sem, pool):
+    try:
+        async with sem, session.get(link, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return None
+            html = await response.read()
+        article = parse_article(link, html)
+        # Score on a worker thread so other fetches keep moving meanwhile
+        loop = asyncio.get_running_loop()
+        article['sentiment'] = await loop.run_in_executor(pool, get_sentiment_label, article['content'])
+        return article
+    except Exception as e:
+        print(f"Error processing article: {e}")
+        return None
+
+
+async def _gather(links):
+    # Bounded concurrency keeps us clear of u.today rate limits
+    sem = asyncio.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*[fetch_and_parse(link, session, sem, pool) for link in links])
+    return [result for result in results if result]
+
+
+def _get_page():
+    # Launch Chromium once and keep it alive for warm-container reuse
+    global _PW, _BROWSER
+    if _BROWSER is None:
+        from playwright.sync_api import sync_playwright
+        _PW = sync_playwright().start()
+        _BROWSER = _PW.chromium.launch(
+            headless=True,
+            args=['--disable-gpu', '--no-sandbox', '--single-process', '--no-zygote', '--disable-dev-shm-usage']
+        )
+    return _BROWSER.new_page()
+
+
+def fetch_listing_html():
+    # Only fall back to a headless browser if the listing page requires JS
+    if USE_PLAYWRIGHT:
+        page = _get_page()
+        try:
+            page.goto(LISTING_URL, timeout=60000)
+            page.wait_for_timeout(3000)  # wait for content to load
+            return page.content()
+        finally:
+            page.close()
+
+    response = _SESSION.get(LISTING_URL, timeout=15)
+    if response.status_code != 200:
+        print(f"❌ Failed to fetch main page: {response.status_code}")
+        return None
+    return response.text
+
+
+def get_latest_article_datetime(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT MAX(datetime) FROM articles")
+        (since,) = cur.fetchone()
+    # Stored the same way the scraper formats dates, so strings compare chronologically
+    return since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S") if since else None
+
+
+def scrape_articles(conn):
+    links = []
+    since = get_latest_article_datetime(conn)
+    html = fetch_listing_html()
+    if not html:
+        return pd.DataFrame()
+
+    soup = BeautifulSoup(html, 'lxml')
+    articles = soup.select('div.news__item')
+
+    # Listing is newest-first, so stop at the first strictly older article; dates
+    # only have minute precision, and ON CONFLICT skips same-minute ones we already have
+    for article in articles:
+        date_tag = article.select_one('div.news__item-date')
+        listing_date = parse_article_date(date_tag.get_text(strip=True)) if date_tag else None
+        if since and listing_date and listing_date < since:
+            break
+
+        title_tag = article.select_one('div.news__item-title')
+        a_tag = title_tag.find_parent('a') if title_tag else None
+        href = a_tag['href'] if a_tag and 'href' in a_tag.attrs else None
+        link = href if href and href.startswith("http") else f"https://u.today{href}" if href else None
+        if link:
+            links.append(link)
+
+    results = asyncio.run(_gather(links))
     return pd.DataFrame(results)
 
 def get_sentiment_label(text):
     try:
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        if polarity > 0.1:
+        score = _SIA.polarity_scores(text)['compound']
+        if score > 0.05:
             return 'positive'
-        elif polarity < -0.1:
+        elif score < -0.05:
             return 'negative'
         else:
             return 'neutral'
     except Exception:
         return 'unknown'
     
-def insert_articles(df_articles):
-    def norm_title(t): return t.strip().lower() if isinstance(t, str) else t
-    def norm_dt(dt):
-        try:
-            ts = pd.to_datetime(dt, errors="coerce")
-            if pd.isnull(ts):
-                ts = pd.to_datetime(dt, errors="coerce", dayfirst=True)
-            if not pd.isnull(ts):
-                return ts.tz_localize(None).strftime("%Y-%m-%dT%H:%M:%S")
-        except:
-            return None
-
-    # Deduplicate
-    existing = set(
-        (norm_title(row["title"]), norm_dt(row["datetime"]))
-        for row in supabase.table("articles").select("title", "datetime").execute().data
-    )
-
-    df_articles["title_norm"] = df_articles["title"].apply(norm_title)
-    df_articles["datetime_norm"] = df_articles["datetime"].apply(norm_dt)
-
-    df_articles_new = df_articles[
-        ~df_articles.apply(lambda row: (row["title_norm"], row["datetime_norm"]) in existing, axis=1)
-    ].copy()
-
-    df_articles_new = df_articles_new.drop(columns=["title_norm", "datetime_norm"], errors="ignore")
-
-    articles_list = df_articles_new[["title", "link", "author", "datetime", "content", "sentiment"]].to_dict("records")
-
-    for article in articles_list:
-        ts = pd.to_datetime(article.get("datetime"), errors="coerce")
-        article["datetime"] = ts.strftime("%Y-%m-%dT%H:%M:%S") if not pd.isnull(ts) else None
-
-    if articles_list:
-        supabase.table("articles").insert(articles_list).execute()
-        print(f"✅ Inserted {len(articles_list)} new articles.")
+def insert_articles(conn, df_articles):
+    if df_articles.empty:
+        print("✅ No articles to process.")
+        return
+
+    df_articles = df_articles[["title", "link", "author", "datetime", "content", "sentiment"]].copy()
+
+    # Datetimes are already ISO strings (or None) from parse_article_date
+    df_articles = df_articles.astype(object).where(pd.notnull(df_articles), None)
+
+    rows = list(df_articles.itertuples(index=False, name=None))
+
+    # Duplicates are skipped by the unique index on (title, datetime)
+    with conn.cursor() as cur:
+        inserted = execute_values(
+            cur,
+            "INSERT INTO articles (title, link, author, datetime, content, sentiment) "
+            "VALUES %s ON CONFLICT DO NOTHING RETURNING id",
+            rows,
+            fetch=True
+        )
+        conn.commit()
+
+    if inserted:
+        print(f"✅ Inserted {len(inserted)} new articles.")
     else:
         print("✅ No new articles to insert.")
 
 
-def insert_binance_data():
-    latest = supabase.table("value").select("open_time").order("open_time", desc=True).limit(1).execute()
-    params = {}
-    if latest.data and latest.data[0].get("open_time"):
-        ts = pd.to_datetime(latest.data[0]["open_time"])
-        params = {"startTime": int(ts.timestamp() * 1000)}
+def ms_to_utc(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
 
-    resp = requests.get(BINANCE_ENDPOINT, params=params)
+def insert_binance_data(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT MAX(open_time) FROM value")
+        (latest_ts,) = cur.fetchone()
+    params = {}
+    latest_ms = 0
+    if latest_ts:
+        latest_ms = int(latest_ts.timestamp() * 1000)
+        params = {"startTime": latest_ms}
+
+    resp = _SESSION.get(BINANCE_ENDPOINT, params=params, timeout=10)
+    if resp.status_code != 200:
+        print(f"❌ Failed to fetch Binance data: {resp.status_code}")
+        return
     columns = [
         "open_time", "open", "high", "low", "close", "volume", "close_time",
         "quote_asset_volume", "number_of_trades",
         "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume", "ignore"
     ]
-    df = pd.DataFrame(resp.json(), columns=columns)
-    df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-    df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-
-    existing = set(pd.to_datetime(
-        [row["open_time"] for row in supabase.table("value").select("open_time").execute().data], utc=True
-    ))
-    df = df[~df["open_time"].isin(existing)]
+    # Binance returns rows from startTime inclusive, so drop the one we already have
+    rows = [
+        (ms_to_utc(r[0]), *r[1:6], ms_to_utc(r[6]), *r[7:])
+        for r in orjson.loads(resp.content) if r[0] > latest_ms
+    ]
 
-    if df.empty:
+    if not rows:
         print("✅ No new Binance data to insert.")
         return
 
-    for col in ["open_time", "close_time"]:
-        df[col] = df[col].dt.strftime("%Y-%m-%dT%H:%M:%S%z")
-    value_list = df.where(pd.notnull(df), None).to_dict("records")
-    supabase.table("value").insert(value_list).execute()
-    print(f"✅ Inserted {len(value_list)} Binance rows.")
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            f"INSERT INTO value ({', '.join(columns)}) VALUES %s ON CONFLICT (open_time) DO NOTHING",
+            rows,
+            page_size=500
+        )
+        conn.commit()
+    print(f"✅ Inserted {len(rows)} Binance rows.")
 
 
 def main():
-    create_tables_if_not_exists()
-    df_articles = scrape_articles()
-    insert_articles(df_articles)
-    insert_binance_data()
+    # One pooled connection for the whole run, reused by later warm invocations
+    conn = get_conn()
+    try:
+        create_tables_if_not_exists(conn)
+        # Without the index inserts can't deduplicate, so skip articles this run
+        if create_article_dedup_index(conn):
+            df_articles = scrape_articles(conn)
+            insert_articles(conn, df_articles)
+        insert_binance_data(conn)
+    finally:
+        get_conn_pool().putconn(conn)
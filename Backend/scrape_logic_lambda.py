@@ -1,127 +1,285 @@
 # Lambda-compatible version of scraping logic
 import os
+import re
 import time
-import pandas as pd
+import asyncio
+import aiohttp
+import orjson
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from bs4 import BeautifulSoup
-from textblob import TextBlob
+import lxml.html
+from lxml import etree
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from dotenv import load_dotenv
-from supabase import create_client, Client
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # INIT
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 BINANCE_ENDPOINT = os.getenv("BINANCE_ENDPOINT")
 DB_CONN = os.getenv("DB_CONN")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Set once to delete existing duplicate articles so the dedup index can be built
+DEDUPE_ARTICLES = os.getenv("DEDUPE_ARTICLES", "false").lower() == "true"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+MAX_CONCURRENT_REQUESTS = 10
+
+# Shared keep-alive session for the listing page and Binance, retrying transient errors
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # raise_on_status=False hands back the last 429/5xx so callers check status_code
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+# u.today's format first (e.g. "Thu, 21/11/2024 - 14:05"), then variants without
+# the weekday or separator; strptime already accepts single-digit fields
+ARTICLE_DATE_FORMATS = (
+    "%a, %d/%m/%Y - %H:%M",
+    "%d/%m/%Y - %H:%M",
+    "%a, %d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+)
+
+# Built once per process so warm invocations reuse the loaded lexicon
+_SIA = SentimentIntensityAnalyzer()
+
+# Kept at module scope so warm Lambda invocations reuse the open connection
+_CONN_POOL = None
+
+
+def get_conn_pool():
+    global _CONN_POOL
+    if _CONN_POOL is None or _CONN_POOL.closed:
+        _CONN_POOL = ThreadedConnectionPool(1, 3, DB_CONN)
+    return _CONN_POOL
+
+
+def reset_conn_pool():
+    global _CONN_POOL
+    if _CONN_POOL is not None and not _CONN_POOL.closed:
+        _CONN_POOL.closeall()
+    _CONN_POOL = None
+
+
+def get_conn():
+    # A warm container can hold a connection the server has since closed, so
+    # check it before use and rebuild the pool once if it is dead
+    conn = get_conn_pool().getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        print("🔌 Stale database connection, reconnecting")
+        reset_conn_pool()
+        conn = get_conn_pool().getconn()
+    return conn
 
 
-def create_tables_if_not_exists():
+def create_tables_if_not_exists(conn):
     try:
-        with psycopg2.connect(DB_CONN) as conn:
-            with conn.cursor() as cur: 
-                cur.execute('''
-                    CREATE TABLE IF NOT EXISTS value (
-                        open_time TIMESTAMPTZ PRIMARY KEY,
-                        open NUMERIC, high NUMERIC, low NUMERIC, close NUMERIC, volume NUMERIC,
-                        close_time TIMESTAMPTZ, quote_asset_volume NUMERIC,
-                        number_of_trades INTEGER, taker_buy_base_asset_volume NUMERIC,
-                        taker_buy_quote_asset_volume NUMERIC, ignore TEXT
-                    );
-                ''')
+        with conn.cursor() as cur: 
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS value (
+                    open_time TIMESTAMPTZ PRIMARY KEY,
+                    open NUMERIC, high NUMERIC, low NUMERIC, close NUMERIC, volume NUMERIC,
+                    close_time TIMESTAMPTZ, quote_asset_volume NUMERIC,
+                    number_of_trades INTEGER, taker_buy_base_asset_volume NUMERIC,
+                    taker_buy_quote_asset_volume NUMERIC, ignore TEXT
+                );
+            ''')
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                    title TEXT, link TEXT, author TEXT,
+                    datetime TIMESTAMPTZ, content TEXT, sentiment TEXT
+                );
+            ''')
+            conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error creating tables: {e}")
+
+
+def create_article_dedup_index(conn):
+    # Lets inserts deduplicate on (title, datetime) without reading the table first.
+    # NULLS NOT DISTINCT (Postgres 15+) makes undated articles collide too.
+    # Returns False when the index is missing, so only the article insert is skipped
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('articles_title_dt_key')")
+            (index,) = cur.fetchone()
+            if index is None:
+                cur.execute("SET LOCAL lock_timeout = '5s'")
+                if DEDUPE_ARTICLES:
+                    # One-off, opt-in: rows stored before the index existed can hold
+                    # duplicates that make it fail to build. Keep the oldest per key
+                    cur.execute('''
+                        DELETE FROM articles WHERE id IN (
+                            SELECT id FROM (
+                                SELECT id, row_number() OVER (
+                                    PARTITION BY lower(btrim(title)), datetime ORDER BY id
+                                ) AS rn
+                                FROM articles
+                            ) ranked
+                            WHERE rn > 1
+                        );
+                    ''')
+                    print(f"🧹 Removed {cur.rowcount} duplicate articles")
                 cur.execute('''
-                    CREATE TABLE IF NOT EXISTS articles (
-                        id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                        title TEXT, link TEXT, author TEXT,
-                        datetime TIMESTAMPTZ, content TEXT, sentiment TEXT
-                    );
+                    CREATE UNIQUE INDEX articles_title_dt_key
+                    ON articles (lower(btrim(title)), datetime) NULLS NOT DISTINCT;
                 ''')
-                conn.commit()
+        conn.commit()
+        return True
     except Exception as e:
-        print(f"❌ Error creating tables: {e}")
+        conn.rollback()
+        print(f"❌ Article dedup index missing, skipping article insert: {e}")
+        return False
+
+
+def parse_article_date(raw_date):
+    cleaned = ' '.join(raw_date.split())
+    for fmt in ARTICLE_DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).strftime("%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            continue
+    print(f"⚠️ Unrecognized article date: {raw_date!r}")
+    return None
+
+
+def _class_xpath(tag, cls):
+    return etree.XPath(f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]")
+
+
+_TITLE_XPATH = _class_xpath('h1', 'article__title')
+_DATE_XPATH = _class_xpath('div', 'article__short-date')
+_AUTHOR_XPATH = _class_xpath('div', 'author-brief__name')
+_PARAGRAPH_XPATH = etree.XPath('//p[@dir="ltr"]')
+_BY_RE = re.compile(r'^by\s+', re.I)
+
+
+def _text(el):
+    return etree.tostring(el, method='text', encoding='unicode', with_tail=False).strip()
+
+
+def parse_article(link, html):
+    tree = lxml.html.fromstring(html)
+    h1_tags = _TITLE_XPATH(tree)
+    article_title = _text(h1_tags[0]) if h1_tags else 'N/A'
+
+    date_tags = _DATE_XPATH(tree)
+    raw_date = _text(date_tags[0]) if date_tags else None
+    article_datetime = parse_article_date(raw_date) if raw_date else None
+
+    author_tags = _AUTHOR_XPATH(tree)
+    author_name = _BY_RE.sub('', _text(author_tags[0])) if author_tags else 'N/A'
+
+    p_tags = _PARAGRAPH_XPATH(tree)
+    article_text = '\n'.join(_text(p) for p in p_tags) if p_tags else 'N/A'
+
+    return {
+        'title': article_title,
+        'datetime': article_datetime,
+        'author': author_name,
+        'link': link,
+        'content': article_text
+    }
+
+
+async def fetch_and_parse(link, session, sem, pool):
+    try:
+        async with sem, session.get(link, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                print(f"❌ Failed to fetch article {link}: {response.status}")
+                return None
+            html = await response.read()
+        article = parse_article(link, html)
+        # Score on a worker thread so other fetches keep moving meanwhile
+        loop = asyncio.get_running_loop()
+        article['sentiment'] = await loop.run_in_executor(pool, get_sentiment_label, article['content'])
+        print(f"✅ Processed article: {article['title'][:50]}...")
+        return article
+    except Exception as e:
+        print(f"❌ Error processing article {link}: {e}")
+        return None
+
+
+async def _gather(links):
+    # Bounded concurrency keeps us clear of u.today rate limits
+    sem = asyncio.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*[fetch_and_parse(link, session, sem, pool) for link in links])
+    return [result for result in results if result]
 
 
-def scrape_articles_requests():
+def get_latest_article_datetime(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT MAX(datetime) FROM articles")
+        (since,) = cur.fetchone()
+    # Stored the same way the scraper formats dates, so strings compare chronologically
+    return since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S") if since else None
+
+
+def scrape_articles_requests(conn):
     """Simplified version using only requests (no Playwright)"""
     results = []
     try:
-        # Use requests with headers to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get("https://u.today/search/node?keys=bitcoin", headers=headers)
+        since = get_latest_article_datetime(conn)
+        response = _SESSION.get("https://u.today/search/node?keys=bitcoin", timeout=10)
         if response.status_code != 200:
             print(f"❌ Failed to fetch main page: {response.status_code}")
-            return pd.DataFrame(results)
+            return results
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        articles = soup.find_all('div', class_='news__item')
+        soup = BeautifulSoup(response.text, 'lxml')
+        articles = soup.select('div.news__item')
         
         print(f"📰 Found {len(articles)} articles to process")
-        
-        for i, article in enumerate(articles[:5]):  # Limit to 5 articles for testing
-            try:
-                title_tag = article.find('div', class_='news__item-title')
-                a_tag = title_tag.find_parent('a') if title_tag else None
-                href = a_tag['href'] if a_tag and 'href' in a_tag.attrs else None
-                link = href if href and href.startswith("http") else f"https://u.today{href}" if href else None
-                if not link:
-                    continue
-
-                # Get article content
-                article_response = requests.get(link, headers=headers)
-                if article_response.status_code != 200:
-                    continue
-
-                article_soup = BeautifulSoup(article_response.text, 'html.parser')
-                h1_tag = article_soup.find('h1', class_='article__title')
-                article_title = h1_tag.get_text(strip=True) if h1_tag else 'N/A'
-
-                date_tag = article_soup.find('div', class_='article__short-date')
-                raw_date = date_tag.get_text(strip=True) if date_tag else None
-                article_datetime = pd.to_datetime(raw_date, errors="coerce", dayfirst=True).strftime("%Y-%m-%dT%H:%M:%S") if raw_date else None
-
-                author_tag = article_soup.find('div', class_='author-brief__name')
-                author_name = author_tag.get_text(strip=True) if author_tag else 'N/A'
-                if author_name.lower().startswith('by'):
-                    author_name = author_name[2:].strip()
-
-                p_tags = article_soup.find_all('p', attrs={'dir': 'ltr'})
-                article_text = '\n'.join([p.get_text(strip=True) for p in p_tags]) if p_tags else 'N/A'
-
-                sentiment = get_sentiment_label(article_text)
-
-                results.append({
-                    'title': article_title,
-                    'datetime': article_datetime,
-                    'author': author_name,
-                    'link': link,
-                    'content': article_text,
-                    'sentiment': sentiment
-                })
-
-                print(f"✅ Processed article {i+1}: {article_title[:50]}...")
-
-            except Exception as e:
-                print(f"❌ Error processing article {i+1}: {e}")
+
+        links = []
+        for article in articles[:5]:  # Limit to 5 articles for testing
+            # Listing is newest-first, so stop at the first strictly older article; dates
+            # only have minute precision, and ON CONFLICT skips same-minute ones we already have
+            date_tag = article.select_one('div.news__item-date')
+            listing_date = parse_article_date(date_tag.get_text(strip=True)) if date_tag else None
+            if since and listing_date and listing_date < since:
+                print(f"⏹️ Reached already stored articles at {listing_date}")
+                break
+
+            title_tag = article.select_one('div.news__item-title')
+            a_tag = title_tag.find_parent('a') if title_tag else None
+            href = a_tag['href'] if a_tag and 'href' in a_tag.attrs else None
+            link = href if href and href.startswith("http") else f"https://u.today{href}" if href else None
+            if link:
+                links.append(link)
+
+        # Fetch all article pages concurrently
+        results = asyncio.run(_gather(links))
 
     except Exception as e:
         print(f"❌ Error in scraping: {e}")
     
-    return pd.DataFrame(results)
+    return results
 
 
 def get_sentiment_label(text):
     try:
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        if polarity > 0.1:
+        score = _SIA.polarity_scores(text)['compound']
+        if score > 0.05:
             return 'positive'
-        elif polarity < -0.1:
+        elif score < -0.05:
             return 'negative'
         else:
             return 'neutral'
@@ -129,90 +287,62 @@ def get_sentiment_label(text):
         return 'unknown'
     
 
-def insert_articles(df_articles):
+def insert_articles(conn, articles):
     try:
-        if df_articles.empty:
+        if not articles:
             print("✅ No articles to process.")
             return
-            
-        def norm_title(t): return t.strip().lower() if isinstance(t, str) else t
-        def norm_dt(dt):
-            try:
-                ts = pd.to_datetime(dt, errors="coerce")
-                if pd.isnull(ts):
-                    ts = pd.to_datetime(dt, errors="coerce", dayfirst=True)
-                if not pd.isnull(ts):
-                    return ts.tz_localize(None).strftime("%Y-%m-%dT%H:%M:%S")
-            except:
-                return None
-
-        # Get existing articles for deduplication
-        existing_data = supabase.table("articles").select("title", "datetime").execute().data
-        existing = set(
-            (norm_title(row["title"]), norm_dt(row["datetime"]))
-            for row in existing_data
-        )
-        print(f"📊 Found {len(existing)} existing articles in database")
 
-        # Apply normalization to scraped articles
-        df_articles["title_norm"] = df_articles["title"].apply(norm_title)
-        df_articles["datetime_norm"] = df_articles["datetime"].apply(norm_dt)
-
-        # Filter out duplicates
-        def is_not_duplicate(row):
-            key = (row["title_norm"], row["datetime_norm"])
-            return key not in existing
-
-        df_articles_new = df_articles[df_articles.apply(is_not_duplicate, axis=1)].copy()
-        df_articles_new = df_articles_new.drop(columns=["title_norm", "datetime_norm"], errors="ignore")
+        # Datetimes are already ISO strings (or None) from parse_article_date
+        rows = [
+            (a["title"], a["link"], a["author"], a["datetime"], a["content"], a["sentiment"])
+            for a in articles
+        ]
 
-        if df_articles_new.empty:
+        # Duplicates are skipped by the unique index on (title, datetime)
+        with conn.cursor() as cur:
+            inserted = execute_values(
+                cur,
+                "INSERT INTO articles (title, link, author, datetime, content, sentiment) "
+                "VALUES %s ON CONFLICT DO NOTHING RETURNING id",
+                rows,
+                fetch=True
+            )
+            conn.commit()
+
+        if inserted:
+            print(f"✅ Total articles inserted: {len(inserted)}")
+        else:
             print("✅ No new articles to insert.")
-            return
-
-        articles_list = df_articles_new[["title", "link", "author", "datetime", "content", "sentiment"]].to_dict("records")
-
-        # Clean up datetime format
-        for article in articles_list:
-            ts = pd.to_datetime(article.get("datetime"), errors="coerce")
-            article["datetime"] = ts.strftime("%Y-%m-%dT%H:%M:%S") if not pd.isnull(ts) else None
-
-        # Insert in smaller batches to avoid issues
-        batch_size = 10
-        total_inserted = 0
-        
-        for i in range(0, len(articles_list), batch_size):
-            batch = articles_list[i:i+batch_size]
-            try:
-                supabase.table("articles").insert(batch).execute()
-                total_inserted += len(batch)
-                print(f"✅ Inserted batch of {len(batch)} articles")
-            except Exception as batch_error:
-                print(f"⚠️ Failed to insert batch {i//batch_size + 1}: {batch_error}")
-                continue
-        
-        print(f"✅ Total articles inserted: {total_inserted}")
             
     except Exception as e:
+        conn.rollback()
         print(f"⚠️ Warning: Articles insertion failed: {e}")
         # Don't raise the exception - continue with execution
 
 
-def insert_binance_data():
+def ms_to_utc(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def insert_binance_data(conn):
     try:
-        latest = supabase.table("value").select("open_time").order("open_time", desc=True).limit(1).execute()
+        # MAX() reads the right-most leaf of the open_time primary key
+        with conn.cursor() as cur:
+            cur.execute("SELECT MAX(open_time) FROM value")
+            (latest_ts,) = cur.fetchone()
         
         # Get data starting from the latest timestamp
         params = {}
-        if latest.data and latest.data[0].get("open_time"):
-            # Ensure we're working with UTC timezone-aware datetime
-            ts = pd.to_datetime(latest.data[0]["open_time"], utc=True)
+        latest_ms = 0
+        if latest_ts:
             # Use startTime to get data from this point forward
-            params = {"startTime": int(ts.timestamp() * 1000)}
-            print(f"📅 Fetching Binance data from: {ts} (UTC)")
-            print(f"📅 Timestamp for API: {int(ts.timestamp() * 1000)}")
+            latest_ms = int(latest_ts.timestamp() * 1000)
+            params = {"startTime": latest_ms}
+            print(f"📅 Fetching Binance data from: {latest_ts}")
+            print(f"📅 Timestamp for API: {latest_ms}")
 
-        resp = requests.get(BINANCE_ENDPOINT, params=params)
+        resp = _SESSION.get(BINANCE_ENDPOINT, params=params, timeout=10)
         if resp.status_code != 200:
             print(f"❌ Failed to fetch Binance data: {resp.status_code}")
             return
@@ -222,53 +352,36 @@ def insert_binance_data():
             "quote_asset_volume", "number_of_trades",
             "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume", "ignore"
         ]
-        df = pd.DataFrame(resp.json(), columns=columns)
-        # Ensure all timestamps are UTC timezone-aware
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-        
-        print(f"📈 Fetched {len(df)} Binance records")
-        if len(df) > 0:
-            print(f"🔍 First fetched record: {df.iloc[0]['open_time']} (UTC)")
-            print(f"🔍 Last fetched record: {df.iloc[-1]['open_time']} (UTC)")
-
-        # Filter to exclude the latest timestamp we already have
-        if latest.data and latest.data[0].get("open_time"):
-            # Ensure both timestamps are UTC timezone-aware for proper comparison
-            latest_ts = pd.to_datetime(latest.data[0]["open_time"], utc=True)
-            # Only keep records AFTER the latest timestamp (exclude the exact match)
-            df_new = df[df["open_time"] > latest_ts]
-            print(f"🔍 Latest in DB: {latest_ts} (UTC)")
-            print(f"🆕 New records after deduplication: {len(df_new)}")
-            
-            if len(df_new) > 0:
-                print(f"📅 First new record: {df_new.iloc[0]['open_time']} (UTC)")
-                print(f"📅 Last new record: {df_new.iloc[-1]['open_time']} (UTC)")
-        else:
-            df_new = df
-            print("🔍 No existing data found, inserting all records")
+        klines = orjson.loads(resp.content)
+        print(f"📈 Fetched {len(klines)} Binance records")
+
+        # Only keep records AFTER the latest timestamp (exclude the exact match).
+        # Rows go straight to execute_values as tuples with UTC datetimes.
+        rows = [
+            (ms_to_utc(r[0]), *r[1:6], ms_to_utc(r[6]), *r[7:])
+            for r in klines if r[0] > latest_ms
+        ]
+        print(f"🆕 New records after deduplication: {len(rows)}")
 
-        if df_new.empty:
+        if not rows:
             print("✅ No new Binance data to insert.")
             return
 
-        # Format timestamps for insertion (PostgreSQL compatible format with timezone)
-        df_formatted = df_new.copy()
-        for col in ["open_time", "close_time"]:
-            # Keep timezone information for proper storage
-            df_formatted[col] = df_formatted[col].dt.strftime("%Y-%m-%dT%H:%M:%S%z")
-        
-        value_list = df_formatted.where(pd.notnull(df_formatted), None).to_dict("records")
-        
-        if value_list:
-            print(f"📊 Inserting {len(value_list)} new Binance records...")
-            print(f"🔍 Sample record timestamp: {value_list[0]['open_time']}")
-            supabase.table("value").insert(value_list).execute()
-            print(f"✅ Successfully inserted {len(value_list)} Binance rows.")
-        else:
-            print("✅ No new Binance data to insert.")
+        print(f"📅 First new record: {rows[0][0]} (UTC)")
+        print(f"📅 Last new record: {rows[-1][0]} (UTC)")
+        print(f"📊 Inserting {len(rows)} new Binance records...")
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                f"INSERT INTO value ({', '.join(columns)}) VALUES %s ON CONFLICT (open_time) DO NOTHING",
+                rows,
+                page_size=500
+            )
+            conn.commit()
+        print(f"✅ Successfully inserted {len(rows)} Binance rows.")
             
     except Exception as e:
+        conn.rollback()
         print(f"⚠️ Warning: Binance data insertion failed: {e}")
         import traceback
         traceback.print_exc()
@@ -277,8 +390,15 @@ def insert_binance_data():
 
 def main():
     print("🚀 Starting Lambda scraping function...")
-    create_tables_if_not_exists()
-    df_articles = scrape_articles_requests()  # Using requests version
-    insert_articles(df_articles)
-    insert_binance_data()
+    # One pooled connection for the whole run, reused by later warm invocations
+    conn = get_conn()
+    try:
+        create_tables_if_not_exists(conn)
+        # Without the index inserts can't deduplicate, so skip articles this run
+        if create_article_dedup_index(conn):
+            articles = scrape_articles_requests(conn)  # Using requests version
+            insert_articles(conn, articles)
+        insert_binance_data(conn)
+    finally:
+        get_conn_pool().putconn(conn)
     print("✅ Lambda function completed successfully!")
@@ -1,162 +1,216 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 import os
 import plotly.graph_objects as go
 import pytz
-
-# CRITICAL: Disable ALL Streamlit caching
-st.cache_data.clear()
-st.cache_resource.clear()
-
-# Load environment variables
-load_dotenv()
-url: str = os.getenv("SUPABASE_URL")
-key: str = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key)
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 st.set_page_config(page_title="Bitcoin Dashboard", layout="wide")
 
+# One Supabase client (and HTTP connection pool) shared across reruns and sessions
+@st.cache_resource
+def get_supabase() -> Client:
+    load_dotenv()
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
 # Define timezone constants
 UTC = pytz.UTC
 MEZ = pytz.timezone('Europe/Berlin')
 
-# Force fresh data on every page load
-if 'data_refresh' not in st.session_state:
-    st.session_state.data_refresh = 0
+# Swaps "," and "." in one pass for European number formatting
+EURO_SEPARATORS = str.maketrans({",": ".", ".": ","})
+
+# --- Fetch Bitcoin value data (server-side time window) ---
+VALUE_COLUMNS = "open_time,close,high,low,volume,number_of_trades"
+DEFAULT_POINTS = 1000
+MAX_VALUE_ROWS = 50000
+ARTICLE_COLUMNS = "datetime,sentiment,title,link,author"
+SENTIMENT_DTYPE = pd.CategoricalDtype(["positive", "neutral", "negative", "unknown"])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_first_open_time():
+    response = get_supabase().table("value").select("open_time").order("open_time").limit(1).execute()
+    return response.data[0]["open_time"] if response.data else None
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_value_range(start_iso):
+    # One bounded round-trip, newest first: if the limit or the Supabase API
+    # "Max rows" cap truncates the response, only the oldest rows are lost.
+    # get_value_df sorts the rows back into ascending order. The exact count
+    # tells the caller whether anything was cut
+    response = get_supabase().table("value").select(VALUE_COLUMNS, count="exact").gte("open_time", start_iso).order("open_time", desc=True).limit(MAX_VALUE_ROWS).execute()
+    return response.data, response.count
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_latest_values(limit):
+    response = get_supabase().table("value").select(VALUE_COLUMNS).order("open_time", desc=True).limit(limit).execute()
+    return response.data
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_articles_data():
+    # Skip id and the full article body; the dashboard never shows them. Newest
+    # first so the "Max rows" cap drops the oldest articles, not the recent ones;
+    # get_articles_df sorts them back into ascending order
+    response = get_supabase().table("articles").select(ARTICLE_COLUMNS).order("datetime", desc=True, nullsfirst=False).execute()
+    return response.data
 
-st.session_state.data_refresh += 1
+# --- Downsample chart series so Plotly only draws what the screen can show ---
+CHART_PIXELS = 1000
+
+def m4(df, y_col, n_px=CHART_PIXELS):
+    # Keep first, last, min and max per pixel-wide time bucket: at most 4 points per
+    # pixel, drawn identically to the raw series however long the range is
+    if len(df) <= 4 * n_px:
+        return df
+    x_ns = df["open_time"].astype("int64").to_numpy()
+    bins = np.linspace(x_ns[0], x_ns[-1], n_px + 1)
+    bucket = np.clip(np.searchsorted(bins, x_ns, side="right") - 1, 0, n_px - 1)
+    grouped = pd.Series(df[y_col].to_numpy(dtype="float64")).groupby(bucket)
+    first = np.flatnonzero(np.diff(bucket, prepend=-1))
+    last = np.append(first[1:] - 1, len(df) - 1)
+    idx = np.unique(np.concatenate([first, last, grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+    return df.iloc[idx]
+
+# --- Parsed DataFrames, cached so reruns skip the tz parse and sort ---
+@st.cache_data(ttl=30, show_spinner=False)
+def get_value_df(start_iso=None):
+    # Returns the frame, its sorted UTC nanoseconds for searchsorted, and whether
+    # the range came back truncated
+    if start_iso:
+        rows, total = fetch_value_range(start_iso)
+    else:
+        rows = fetch_latest_values(DEFAULT_POINTS)
+        total = len(rows)
+    if not rows:
+        return pd.DataFrame(), np.empty(0, dtype="int64"), False
+    df = pd.DataFrame(rows)
+    # Pin to ns so the int64 view lines up with Timestamp.value (pandas 3 parses to us)
+    df["open_time"] = pd.to_datetime(df["open_time"], errors="coerce", utc=True, format="ISO8601").dt.as_unit("ns")
+    # Arrow-backed value columns reach st.dataframe without a pandas->Arrow copy;
+    # open_time stays numpy so searchsorted keeps its int64 view
+    value_cols = df.columns.drop("open_time")
+    df[value_cols] = df[value_cols].convert_dtypes(dtype_backend="pyarrow")
+    df = df.sort_values("open_time", ignore_index=True)
+    return df, df["open_time"].astype("int64").to_numpy(), total is not None and total > len(rows)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_articles_df():
+    # Returns the frame and the int64 nanoseconds of its dated rows, so reruns
+    # slice the timeframe with searchsorted without rebuilding the array
+    rows = fetch_articles_data()
+    if not rows:
+        return pd.DataFrame(), np.empty(0, dtype="int64")
+    df = pd.DataFrame(rows)
+    # utc=True localizes naive values to UTC and converts aware ones, in one pass
+    df["datetime_parsed"] = pd.to_datetime(df["datetime"], utc=True, errors="coerce", format="mixed").dt.as_unit("ns")
+    df["datetime_mez"] = df["datetime_parsed"].dt.tz_convert(MEZ)
+    # Integer-coded labels make equality checks and value_counts near-free
+    df["sentiment"] = df["sentiment"].astype(SENTIMENT_DTYPE)
+    df = df.sort_values("datetime_parsed").reset_index(drop=True)
+    # Sorted with NaT last, so the dated rows are a prefix of df
+    return df, df["datetime_parsed"].dropna().astype("int64").to_numpy()
+
+# --- Bitcoin/USD Converter ---
+# A fragment reruns on its own, so typing an amount doesn't rebuild the charts above
+@st.fragment
+def render_converter(latest_close):
+    st.subheader("Bitcoin/USD Converter")
+    conversion_mode = st.selectbox("Select input currency:", ["Bitcoin (BTC)", "US Dollar (USD)"])
+
+    if conversion_mode == "Bitcoin (BTC)":
+        btc_amount = st.number_input("Enter amount in Bitcoin (BTC):", min_value=0.0, value=1.0, step=0.01)
+        usd_value = btc_amount * latest_close
+        st.success(f"{btc_amount} BTC ≈ ${usd_value:,.2f} USD")
+    else:
+        usd_amount = st.number_input("Enter amount in US Dollar (USD):", min_value=0.0, value=1000.0, step=1.0)
+        btc_value = usd_amount / latest_close
+        st.success(f"${usd_amount:,.2f} ≈ {btc_value:.8f} BTC")
 
+# Supabase reads are cached with short TTLs; Refresh drops them immediately
 if st.button("🔄 Refresh Data"):
-    st.cache_data.clear()
-    st.cache_resource.clear()
-    st.session_state.data_refresh += 1
+    fetch_first_open_time.clear()
+    fetch_value_range.clear()
+    fetch_latest_values.clear()
+    fetch_articles_data.clear()
+    get_value_df.clear()
+    get_articles_df.clear()
     st.rerun()
 
 st.title("Bitcoin Dashboard")
 
-# --- Fetch Bitcoin value data (NO CACHING) ---
-@st.cache_data(ttl=0)
-def fetch_value_data():
-    try:
-        response = supabase.table("value").select("*").order("open_time", desc=True).limit(None).execute()
-        return response.data
-    except:
-        try:
-            response = supabase.table("value").select("*").order("open_time", desc=True).limit(10000).execute()
-            return response.data
-        except:
-            all_data = []
-            offset = 0
-            batch_size = 1000
-            
-            while True:
-                batch_response = supabase.table("value").select("*").order("open_time", desc=True).range(offset, offset + batch_size - 1).execute()
-                batch_data = batch_response.data
-                
-                if not batch_data:
-                    break
-                    
-                all_data.extend(batch_data)
-                
-                if len(batch_data) < batch_size:
-                    break
-                    
-                offset += batch_size
-            
-            return all_data
-
-@st.cache_data(ttl=0)
-def fetch_articles_data():
-    response = supabase.table("articles").select("*").execute()
-    return response.data
-
-# Force fresh data fetch
-value_data = fetch_value_data()
-
-if value_data:
-    df_value_full = pd.DataFrame(value_data)
-    
-    # Parse timestamps and convert to MEZ
-    df_value_full["open_time"] = pd.to_datetime(df_value_full["open_time"], errors="coerce", utc=True)
-    df_value_full["open_time_mez"] = df_value_full["open_time"].dt.tz_convert(MEZ)
-    
-    # Sort by time (ensure newest data is last)
-    df_value_full = df_value_full.sort_values("open_time").reset_index(drop=True)
-
-    # --- Time range buttons - PERFECTLY CENTERED ---
-    col1, col2, col3, col4, col5, col6, col7 = st.columns([2, 1, 1, 1, 1, 1, 1.5])
-    with col1:
-        st.write("")  # Empty space
-    with col2:
-        range_btn_1d = st.button("1d")
-    with col3:
-        range_btn_2d = st.button("2d")
-    with col4:
-        range_btn_3d = st.button("3d")
-    with col5:
-        range_btn_7d = st.button("7d")
-    with col6:
-        range_btn_max = st.button("Max")
-    with col7:
-        st.write("")  # Empty space
-
-    # Time filtering logic - This affects BOTH Bitcoin data AND articles
-    now_mez = pd.Timestamp.now(tz=MEZ)
-    
-    # Initialize with default behavior
-    if len(df_value_full) > 1000:
-        df_value = df_value_full.tail(1000).reset_index(drop=True)
-        # Default timeframe for articles (last 1000 points worth of time)
-        article_start_time = df_value["open_time_mez"].min()
-        article_end_time = df_value["open_time_mez"].max()
+# --- Time range selector - PERFECTLY CENTERED ---
+RANGES = {
+    "1d": pd.Timedelta(days=1),
+    "2d": pd.Timedelta(days=2),
+    "3d": pd.Timedelta(days=3),
+    "7d": pd.Timedelta(days=7),
+    "Max": None
+}
+
+col1, col2, col3 = st.columns([2, 5, 1.5])
+with col2:
+    # The selection persists in session state, so reruns keep the same range
+    range_choice = st.segmented_control(
+        "Timeframe", list(RANGES), default="1d", key="range_choice", label_visibility="collapsed"
+    )
+
+# Time filtering logic - This affects BOTH Bitcoin data AND articles
+now_mez = pd.Timestamp.now(tz=MEZ)
+range_delta = RANGES.get(range_choice)
+cutoff_time = now_mez - range_delta if range_delta is not None else None
+
+# The articles query doesn't depend on the range, so it runs on a worker thread
+# while the value rows load here and the two round-trips overlap. The worker gets
+# this run's context so its cached call behaves as it would on the script thread
+with ThreadPoolExecutor(max_workers=1, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+    articles_future = executor.submit(get_articles_df)
+
+    # Only the rows of the selected range are requested from Supabase
+    if range_choice == "Max":
+        first_open_time = fetch_first_open_time()
+        df_value, ts_ns, truncated = get_value_df(first_open_time) if first_open_time else (pd.DataFrame(), np.empty(0, dtype="int64"), False)
+    elif cutoff_time is not None:
+        # Floor to the minute so reruns within the same minute hit the cache
+        df_value, ts_ns, truncated = get_value_df(cutoff_time.tz_convert(UTC).floor("min").isoformat())
     else:
-        df_value = df_value_full.copy()
-        article_start_time = df_value["open_time_mez"].min()
-        article_end_time = df_value["open_time_mez"].max()
-    
-    # Override based on button clicks - This affects BOTH chart AND sentiment
-    if range_btn_max:
-        df_value = df_value_full.copy()
-        article_start_time = df_value["open_time_mez"].min()
-        article_end_time = df_value["open_time_mez"].max()
-    elif range_btn_1d:
-        cutoff_time = now_mez - pd.Timedelta(days=1)
-        df_value = df_value_full[df_value_full["open_time_mez"] >= cutoff_time].copy()
-        article_start_time = cutoff_time
-        article_end_time = now_mez
-    elif range_btn_2d:
-        cutoff_time = now_mez - pd.Timedelta(days=2)
-        df_value = df_value_full[df_value_full["open_time_mez"] >= cutoff_time].copy()
-        article_start_time = cutoff_time
+        # Nothing selected: the last 1000 points
+        df_value, ts_ns, truncated = get_value_df()
+
+    df, article_ns = articles_future.result()
+
+if truncated:
+    st.caption(f"Showing the latest {len(df_value):,} points; older data in this range was not returned.")
+
+if not df_value.empty:
+    # Timeframe for articles - the selected range, or the span of the loaded points
+    if cutoff_time is not None:
+        # The fetch starts at the floored minute; trim to the exact cutoff with a
+        # binary search on the sorted UTC nanoseconds instead of a tz-aware mask
+        i = np.searchsorted(ts_ns, cutoff_time.value, side="left")
+        df_value = df_value.iloc[i:]
+        # A truncated range starts later than the cutoff; match articles to the chart
+        article_start_time = df_value["open_time"].iat[0].tz_convert(MEZ) if truncated else cutoff_time
         article_end_time = now_mez
-    elif range_btn_3d:
-        cutoff_time = now_mez - pd.Timedelta(days=3)
-        df_value = df_value_full[df_value_full["open_time_mez"] >= cutoff_time].copy()
-        article_start_time = cutoff_time
-        article_end_time = now_mez
-    elif range_btn_7d:
-        cutoff_time = now_mez - pd.Timedelta(days=7)
-        df_value = df_value_full[df_value_full["open_time_mez"] >= cutoff_time].copy()
-        article_start_time = cutoff_time
-        article_end_time = now_mez
-
-    # Ensure data is sorted
-    df_value = df_value.sort_values("open_time_mez").reset_index(drop=True)
+    else:
+        # Sorted UTC column: the ends are the span, converted to MEZ as scalars only
+        article_start_time = df_value["open_time"].iat[0].tz_convert(MEZ)
+        article_end_time = df_value["open_time"].iat[-1].tz_convert(MEZ)
 
     # --- Stats for the FILTERED timeframe - CENTERED AND CONNECTED TO BUTTONS ---
     if not df_value.empty:
         # These stats now change based on button selection
-        latest_record_idx = df_value["open_time_mez"].idxmax()
-        close_val = df_value.loc[latest_record_idx, "close"]  # Latest close in selected timeframe
+        close_val = df_value["close"].iat[-1]  # Latest close in selected timeframe (df_value is sorted)
         high_val = df_value["high"].max()  # Highest value in selected timeframe
         low_val = df_value["low"].min()   # Lowest value in selected timeframe
         volume_val = df_value["volume"].sum()  # Total volume in selected timeframe
 
         def euro_style(val):
-            return f"${val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            return "$" + format(val, ",.2f").translate(EURO_SEPARATORS)
 
         stats_html = f"""
         <div style='display: flex; justify-content: center; gap: 60px; margin-bottom: 24px;'>
@@ -191,7 +245,7 @@ if value_data:
             start_val = df_value["close"].iloc[0]
             end_val = df_value["close"].iloc[-1]
             pct_change = ((end_val - start_val) / start_val) * 100 if start_val != 0 else 0
-            start_date = df_value["open_time_mez"].iloc[0].strftime("%b %d")
+            start_date = df_value["open_time"].iloc[0].tz_convert(MEZ).strftime("%b %d")
             arrow = "▲" if pct_change >= 0 else "▼"
             arrow_color = "green" if pct_change >= 0 else "red"
             st.markdown(
@@ -203,9 +257,11 @@ if value_data:
 
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=df_value["open_time_mez"],
-            y=df_value["close"],
+        # Stats above use the full df_value; only the plotted series is downsampled
+        df_close = m4(df_value, "close")
+        fig.add_trace(go.Scattergl(
+            x=df_close["open_time"],
+            y=df_close["close"],
             mode='lines',
             name='Bitcoin Value',
             line=dict(width=2)
@@ -213,7 +269,7 @@ if value_data:
         
         fig.update_layout(
             yaxis_title="Bitcoin Value (USD)",
-            xaxis_title="Time (MEZ)",
+            xaxis_title="Time (UTC)",
             yaxis=dict(tickformat=","),
             height=400,
             margin=dict(l=20, r=20, t=20, b=20),
@@ -225,16 +281,18 @@ if value_data:
         # --- Volume Chart - REDUCED MARGIN ---
         st.subheader("Volume of Trade")
         
+        df_volume = m4(df_value, "volume")
+        df_trades = m4(df_value, "number_of_trades")
         fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(
-            x=df_value["open_time_mez"],
-            y=df_value["volume"],
+        fig2.add_trace(go.Scattergl(
+            x=df_volume["open_time"],
+            y=df_volume["volume"],
             mode='lines',
             name='Volume'
         ))
-        fig2.add_trace(go.Scatter(
-            x=df_value["open_time_mez"],
-            y=df_value["number_of_trades"],
+        fig2.add_trace(go.Scattergl(
+            x=df_trades["open_time"],
+            y=df_trades["number_of_trades"],
             mode='lines',
             name='Number of Trades',
             yaxis='y2'
@@ -242,7 +300,7 @@ if value_data:
         fig2.update_layout(
             yaxis_title="Volume",
             yaxis2=dict(title="Number of Trades", overlaying='y', side='right'),
-            xaxis_title="Time (MEZ)",
+            xaxis_title="Time (UTC)",
             height=300,
             margin=dict(l=20, r=20, t=20, b=10),
             legend=dict(orientation="h", y=1.1, x=0.5, xanchor="center")
@@ -251,47 +309,27 @@ if value_data:
 
         # --- Raw Data Table ---
         with st.expander("Show full raw value table"):
-            df_display = df_value.copy()
-            df_display["open_time_utc"] = df_display["open_time"]
-            df_display = df_display[["open_time_utc", "open_time_mez", "close", "high", "low", "volume", "number_of_trades"]]
+            df_display = df_value[["open_time", "close", "high", "low", "volume", "number_of_trades"]].rename(columns={"open_time": "open_time_utc"})
             st.dataframe(df_display, use_container_width=True)
 
         # --- SENTIMENT ANALYSIS SECTION - MOVED HERE ---
-        data = fetch_articles_data()
-        if data:
-            df = pd.DataFrame(data)
-            
-            def robust_parse_with_timezone(raw_date):
-                try:
-                    dt = pd.to_datetime(raw_date, errors="coerce", utc=True)
-                    if pd.isnull(dt):
-                        dt = pd.to_datetime(raw_date, errors="coerce")
-                        if not pd.isnull(dt) and dt.tzinfo is None:
-                            dt = dt.tz_localize('UTC')
-                    return dt
-                except Exception:
-                    return pd.NaT
-
-            df["datetime_parsed"] = df["datetime"].apply(robust_parse_with_timezone)
-            df["datetime_mez"] = df["datetime_parsed"].dt.tz_convert(MEZ)
-            df = df.sort_values("datetime_parsed").reset_index(drop=True)
-
+        if not df.empty:
             # --- Sentiment Analysis - NOW USES SAME TIME FILTER AS BITCOIN DATA ---
             st.subheader("Sentiment Analysis of Bitcoin News")
 
             # Filter articles based on the SAME timeframe as Bitcoin data
-            mask = (df["datetime_mez"] >= article_start_time) & (df["datetime_mez"] <= article_end_time)
-            filtered_articles = df[mask]
+            # df is sorted by datetime_parsed (NaT last), so slice with two binary searches
+            lo = np.searchsorted(article_ns, article_start_time.value, side="left")
+            hi = np.searchsorted(article_ns, article_end_time.value, side="right")
+            filtered_articles = df.iloc[lo:hi]
 
             if not filtered_articles.empty and "sentiment" in filtered_articles.columns:
                 total = len(filtered_articles)
-                positive_count = (filtered_articles["sentiment"] == "positive").sum()
-                neutral_count = (filtered_articles["sentiment"] == "neutral").sum()
-                negative_count = (filtered_articles["sentiment"] == "negative").sum()
+                sentiment_counts = filtered_articles["sentiment"].value_counts()
 
-                percent_positive = 100 * positive_count / total
-                percent_neutral = 100 * neutral_count / total
-                percent_negative = 100 * negative_count / total
+                percent_positive = 100 * sentiment_counts.get("positive", 0) / total
+                percent_neutral = 100 * sentiment_counts.get("neutral", 0) / total
+                percent_negative = 100 * sentiment_counts.get("negative", 0) / total
 
                 fig_bar = go.Figure()
                 fig_bar.add_trace(go.Bar(
@@ -349,36 +387,29 @@ if value_data:
                 end_str = article_end_time.strftime("%Y-%m-%d %H:%M")
                 
                 with st.expander(f"📰 Articles for selected timeframe ({total} articles from {start_str} to {end_str})"):
-                    for _, article in filtered_articles.iterrows():
-                        sentiment_color = {"positive": "🟢", "negative": "🔴", "neutral": "🟡"}.get(article["sentiment"], "⚪")
-                        article_time_mez = article["datetime_mez"].strftime("%m-%d %H:%M") if pd.notna(article["datetime_mez"]) else "N/A"
-                        st.markdown(f"{sentiment_color} **{article_time_mez}** - [{article['title']}]({article['link']})")
+                    # Virtualized table: only the visible rows are drawn in the browser
+                    df_timeframe = filtered_articles[["datetime_mez", "sentiment", "title", "link"]].copy()
+                    df_timeframe.insert(0, "sentiment_icon", df_timeframe["sentiment"].map({"positive": "🟢", "negative": "🔴", "neutral": "🟡"}).astype(object).fillna("⚪"))
+                    st.dataframe(
+                        df_timeframe,
+                        column_config={
+                            "sentiment_icon": st.column_config.TextColumn(""),
+                            "datetime_mez": st.column_config.DatetimeColumn("Time (MEZ)", format="MM-DD HH:mm"),
+                            "link": st.column_config.LinkColumn("Article", display_text=r"https?://(.*)")
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
             else:
                 st.info(f"No articles found for the selected timeframe.")
 
         # --- Bitcoin/USD Converter - MOVED BELOW SENTIMENT ---
-        st.subheader("Bitcoin/USD Converter")
-        conversion_mode = st.selectbox("Select input currency:", ["Bitcoin (BTC)", "US Dollar (USD)"])
-        
-        latest_close = df_value.loc[df_value["open_time_mez"].idxmax(), "close"]
-
-        if conversion_mode == "Bitcoin (BTC)":
-            btc_amount = st.number_input("Enter amount in Bitcoin (BTC):", min_value=0.0, value=1.0, step=0.01)
-            usd_value = btc_amount * float(latest_close)
-            st.success(f"{btc_amount} BTC ≈ ${usd_value:,.2f} USD")
-        else:
-            usd_amount = st.number_input("Enter amount in US Dollar (USD):", min_value=0.0, value=1000.0, step=1.0)
-            btc_value = usd_amount / float(latest_close)
-            st.success(f"${usd_amount:,.2f} ≈ {btc_value:.8f} BTC")
+        render_converter(float(df_value["close"].iat[-1]))
 
         # --- Articles Table - AT THE BOTTOM ---
-        if data:
+        if not df.empty:
             st.subheader("Bitcoin News")
-            df_display = df.sort_values("datetime_parsed", ascending=False).copy()
-            if "id" in df_display.columns:
-                df_display = df_display.drop(columns=["id"])
-            if "datetime_parsed" in df_display.columns:
-                df_display = df_display.drop(columns=["datetime_parsed"])
+            df_display = df.sort_values("datetime_parsed", ascending=False).drop(columns=["datetime_parsed"])
             st.dataframe(df_display)
         else:
             st.warning("No articles found in the database.")